@@ -6,12 +6,19 @@ import sys
 args = [
     'app.py',                       # Your main script
     '--name=AI_Vision_Snipping',    # Name of the exe
-    '--onefile',                    # Create a single exe file
+    '--onedir',                     # Folder build: starts without unpacking to %TEMP% on every launch
     '--windowed',                   # Don't open a console window
     '--add-data=.env;.',            # Include the .env file
     '--clean',                      # Clean cached data before building
+    '--noupx',                      # Skip UPX so DLLs don't need decompressing at load time
+    '--optimize=2',                 # Bundle bytecode compiled as with python -OO (PyInstaller 6+)
 ]
 
+# Keep packages the app never imports out of the bundle; PyInstaller otherwise
+# picks them up from the build environment, growing the exe and its unpack time.
+for module in ('tests', 'matplotlib', 'scipy', 'pandas', 'IPython', 'pytest'):
+    args.append(f'--exclude-module={module}')
+
 # Only add icon if it exists
 icon_path = 'icon.ico'
 if os.path.exists(icon_path):
@@ -23,4 +30,4 @@ else:
 print("Building executable with PyInstaller...")
 PyInstaller.__main__.run(args)
 
-print("Build completed! Check the dist folder for your executable.") 
\ No newline at end of file
+print("Build completed! Check the dist/AI_Vision_Snipping folder for your executable.") 
\ No newline at end of file
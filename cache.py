@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+
+class ResponseCache:
+    """
+    A small SQLite-backed cache mapping image hashes to Vision API answers,
+    fronted by an in-memory LRU of the last `memory_size` answers so repeat
+    snips in a session skip the database too. Entries older than `ttl`
+    seconds are treated as misses and deleted when the cache is opened. A new
+    connection is opened per call so the cache can be used from worker threads.
+    """
+    def __init__(self, path, ttl, memory_size=64):
+        self.path = path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.memory = OrderedDict()  # key -> (answer, ts)
+        self.memory_lock = threading.Lock()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, ts INTEGER NOT NULL)"
+                )
+                conn.execute("DELETE FROM responses WHERE ts < ?", (int(time.time()) - self.ttl,))
+        except sqlite3.Error as e:
+            # e.g. an unwritable working directory: only the in-memory LRU is used.
+            logging.error("Response cache unavailable at %s: %s", self.path, e)
+
+    @contextmanager
+    def _connect(self):
+        """Yields a connection that commits on success and is always closed."""
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def image_key(image, context=""):
+        """
+        Return the cache key for a PIL image, hashing its mode, size and pixels
+        along with `context`: the request settings (model, prompt version, ...)
+        that shape the answer, so changing any of them misses the cache.
+        """
+        digest = hashlib.blake2b(f"{context}|{image.mode}:{image.size}".encode('utf-8'), digest_size=16)
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached answer for `key`, or None if missing or expired."""
+        with self.memory_lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                answer, ts = entry
+                if ts >= time.time() - self.ttl:
+                    self.memory.move_to_end(key)
+                    return answer
+                del self.memory[key]
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT answer, ts FROM responses WHERE key = ? AND ts >= ?",
+                    (key, int(time.time()) - self.ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.error("Response cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        self._remember(key, *row)
+        return row[0]
+
+    def put(self, key, answer):
+        """Store `answer` under `key`, replacing any previous entry."""
+        self._remember(key, answer, time.time())
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, answer, ts) VALUES (?, ?, ?)",
+                    (key, answer, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logging.error("Response cache write failed: %s", e)
+
+    def _remember(self, key, answer, ts):
+        with self.memory_lock:
+            self.memory[key] = (answer, ts)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
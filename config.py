@@ -1,12 +1,20 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# OpenAI API key from environment variables.
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("Please set the OPENAI_API_KEY environment variable.")
+@lru_cache(maxsize=None)
+def get_api_key():
+    """
+    Return the OpenAI API key from the environment (or .env). It is checked on
+    first use, so a missing key is reported in the app instead of stopping it
+    from starting.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("Please set the OPENAI_API_KEY environment variable.")
+    return api_key
 
 # UI configuration
 DISPLAY_SIZE = (400, 300)
@@ -15,3 +23,45 @@ TEXT_WIDGET_CONFIG = {
     "width": 50,
     "wrap": "word"
 }
+# Streamed chunks arriving within this many milliseconds are inserted together.
+STREAM_FLUSH_MS = 30
+
+# Image encoding: snips larger than the pixel threshold are sent as JPEG,
+# smaller ones as fast, lightly-compressed PNG. A threshold of 0 sends every
+# snip as JPEG, which is several times cheaper to encode and upload.
+PNG_COMPRESS_LEVEL = 1
+JPEG_QUALITY = 85
+JPEG_PIXEL_THRESHOLD = 0
+
+# Cache of Vision API answers, keyed by a hash of the image pixels. Answers are
+# stored on disk; the most recent CACHE_MEMORY_ENTRIES are also kept in memory.
+CACHE_PATH = "vision_cache.sqlite3"
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+CACHE_MEMORY_ENTRIES = 64
+
+# Longest edge, in pixels, of an image sent to the Vision API. Larger snips are
+# downscaled first, cutting upload bytes and image tokens; 1024 px keeps screen
+# text legible while fitting in a small number of vision tiles.
+MAX_UPLOAD_EDGE = 1024
+# Snips whose longest edge is at most this many pixels are sent with
+# detail "low": the API then bills a flat, small token count and still sees
+# every pixel, since low detail only downsamples to 512 px.
+LOW_DETAIL_EDGE = 512
+
+# Set SNIP_DEBUG=1 to save each capture to debug_capture.png.
+DEBUG_CAPTURE = os.getenv("SNIP_DEBUG") == "1"
+
+# Vision API request settings. Generation stops at the token budget or at a
+# run of blank lines, whichever comes first. Temperature 0 keeps answers for
+# the same snip stable.
+MAX_TOKENS = 350
+STOP_SEQUENCES = ["\n\n\n"]
+TEMPERATURE = 0
+# Rate-limited (429), server-error (5xx) and connection-failed requests are
+# retried this many times by the OpenAI client, with exponential backoff.
+API_MAX_RETRIES = 3
+
+# Vision model. Answers from the default model that look like a refusal or are
+# nearly empty are retried once with FALLBACK_MODEL.
+MODEL = os.getenv("SNIP_MODEL", "gpt-4o-mini")
+FALLBACK_MODEL = "gpt-4o"
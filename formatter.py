@@ -4,26 +4,88 @@ import tkinter as tk
 # Regular expression pattern for inline bold text (e.g., **bold**)
 BOLD_PATTERN = re.compile(r'\*\*(.*?)\*\*')
 
+# Single-pass block tokenizer over the whole response. Each alternative consumes
+# one block (a fenced code block, a run of ordinary lines, or one line)
+# including its trailing newline; the named group that matched identifies the
+# block type. Heading and list groups capture their text already stripped of
+# surrounding whitespace.
+BLOCK_PATTERN = re.compile(r'''
+      ^[ \t]*```[^\n]*\n(?P<code>.*?)^[ \t]*```[^\n]*\n?          # fenced code block
+    | ^[ \t]*```.*                                                 # unclosed fence: drop the rest
+    | ^[ \t]*\#\#\#[ ][ \t]*(?P<heading>[^\n]*?\S)[ \t]*$\n?       # ### heading
+    | ^[ \t]*\#\#[ ][ \t]*(?P<subheading>[^\n]*?\S)[ \t]*$\n?      # ## subheading
+    | ^[ \t]*(?P<list>-[ ][^\n]*?\S)[ \t]*$\n?                     # - list item
+    | (?P<plain>(?:^(?![ \t]*(?:```|\#\#\#?[ ]|-[ ]))(?!\Z)[^\n]*\n?)+)  # run of ordinary lines
+    | ^(?!\Z)(?P<line>[^\n]*)\n?                                   # any other line
+''', re.MULTILINE | re.DOTALL | re.VERBOSE)
+
+# Per-line classifier used while a response is still streaming in, when only
+# complete lines are known. Groups mirror BLOCK_PATTERN: like there, a fence
+# line may carry text after the backticks (e.g. a language tag).
+LINE_PATTERN = re.compile(r'''
+    ^[ \t]*(?:
+          (?P<fence>```).*
+        | (?: \#\#\#[ ][ \t]*(?P<heading>.*?\S)
+            | \#\#[ ][ \t]*(?P<subheading>.*?\S)
+            | (?P<list>-[ ].*?\S)
+          )[ \t]*$
+    )
+''', re.VERBOSE)
+
 def insert_bold_text(text_widget, line, base_tag=None):
     """
     Inserts text into 'text_widget' while detecting **bold** segments.
     Optionally applies a base_tag (e.g., "heading" or "list") to the entire line.
     """
-    start_idx = 0
-    for match in BOLD_PATTERN.finditer(line):
-        before_text = line[start_idx:match.start()]
-        if before_text:
-            text_widget.insert(tk.END, before_text, base_tag)
-        bold_text = match.group(1)
-        text_widget.insert(tk.END, bold_text, (base_tag, "bold") if base_tag else ("bold",))
-        start_idx = match.end()
-    if start_idx < len(line):
-        text_widget.insert(tk.END, line[start_idx:], base_tag)
+    insert_segments(text_widget, _bold_segments(line, base_tag))
 
-def format_and_insert_text(text_widget, content):
+def _bold_segments(line, base_tag=None):
+    """
+    Yields (text, tags) pairs for a line, splitting out **bold** segments.
+    BOLD_PATTERN.split alternates plain text and bold captures.
+    """
+    base_tags = (base_tag,) if base_tag else ()
+    for i, part in enumerate(BOLD_PATTERN.split(line)):
+        if i % 2:
+            yield part, base_tags + ("bold",)
+        elif part:
+            yield part, base_tags
+
+def _coalesce(pairs):
+    """Merges adjacent (text, tags) pairs that share the same tags."""
+    segments = []
+    run_parts = []
+    run_tags = None
+    for text, tags in pairs:
+        if tags != run_tags:
+            if run_parts:
+                segments.append(("".join(run_parts), run_tags))
+                run_parts = []
+            run_tags = tags
+        run_parts.append(text)
+    if run_parts:
+        segments.append(("".join(run_parts), run_tags))
+    return segments
+
+def _block_segments(content):
+    """Yields (text, tags) pairs for each block matched by BLOCK_PATTERN."""
+    for match in BLOCK_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        text = match.group(kind)
+        if kind == "code":
+            yield text or "\n", ("code",)
+            continue
+        base_tag = None if kind in ("plain", "line") else kind
+        yield from _bold_segments(text, base_tag)
+        if not (kind == "plain" and text.endswith("\n")):
+            yield "\n", ()
+
+def tokenize_markdown(content):
     """
-    Parses the content with markdown-like formatting cues and inserts it
-    into the provided Tkinter text widget.
+    Parses the content with markdown-like formatting cues into a list of
+    (text, tags) segments, merging adjacent segments that share the same tags.
 
     Supported formatting:
       - Code blocks wrapped in triple backticks (```).
@@ -32,35 +94,57 @@ def format_and_insert_text(text_widget, content):
       - List items (lines starting with "- ").
       - Inline bold text (enclosed in **).
     """
-    text_widget.delete(1.0, tk.END)
-    in_code_block = False
-    code_lines = []
+    if "\r" in content:
+        content = content.replace("\r\n", "\n")
+    return _coalesce(_block_segments(content))
 
-    for line in content.splitlines():
-        stripped_line = line.strip()
-        if stripped_line.startswith("```"):
-            if not in_code_block:
-                in_code_block = True
-                code_lines = []
+class StreamFormatter:
+    """
+    Incrementally formats a response as it streams in. Text is buffered until
+    a line is complete, so markdown cues are never split across chunks, and
+    code-fence state is carried between calls to `feed`.
+    """
+    def __init__(self):
+        self.partial_line = ""
+        self.in_code_block = False
+        self.code_block_has_lines = False
+
+    def feed(self, text):
+        """Returns the (text, tags) segments for any lines completed by `text`."""
+        complete, newline, self.partial_line = (self.partial_line + text).rpartition("\n")
+        if not newline:
+            return []
+        return _coalesce(self._line_segments(complete.replace("\r", "").split("\n")))
+
+    def _line_segments(self, lines):
+        for line in lines:
+            match = LINE_PATTERN.match(line)
+            kind = match.lastgroup if match else None
+            if kind == "fence":
+                if self.in_code_block and not self.code_block_has_lines:
+                    yield "\n", ("code",)  # An empty block still renders one line.
+                self.in_code_block = not self.in_code_block
+                self.code_block_has_lines = False
+            elif self.in_code_block:
+                self.code_block_has_lines = True
+                yield line + "\n", ("code",)
             else:
-                code_text = "\n".join(code_lines)
-                text_widget.insert(tk.END, code_text + "\n", "code")
-                in_code_block = False
-            continue
+                yield from _bold_segments(match.group(kind) if kind else line, kind)
+                yield "\n", ()
 
-        if in_code_block:
-            code_lines.append(line)
-            continue
+def format_and_insert_text(text_widget, content):
+    """
+    Renders the content's markdown-like formatting cues (see tokenize_markdown)
+    into the provided Tkinter text widget, replacing its contents.
+    """
+    text_widget.delete(1.0, tk.END)
+    insert_segments(text_widget, tokenize_markdown(content))
 
-        if stripped_line.startswith("### "):
-            insert_bold_text(text_widget, stripped_line[4:].strip(), "heading")
-            text_widget.insert(tk.END, "\n")
-        elif stripped_line.startswith("## "):
-            insert_bold_text(text_widget, stripped_line[3:].strip(), "subheading")
-            text_widget.insert(tk.END, "\n")
-        elif stripped_line.startswith("- "):
-            insert_bold_text(text_widget, stripped_line, "list")
-            text_widget.insert(tk.END, "\n")
-        else:
-            insert_bold_text(text_widget, line)
-            text_widget.insert(tk.END, "\n")
+def insert_segments(text_widget, segments):
+    """
+    Appends (text, tags) segments to the text widget with a single insert call
+    using Tk's interleaved `text, tags, text, tags, ...` form.
+    """
+    args = [item for segment in segments for item in segment]
+    if args:
+        text_widget.insert(tk.END, *args)
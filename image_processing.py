@@ -1,58 +1,214 @@
-import base64
+import atexit
 from io import BytesIO
-import openai
 import logging
-from config import OPENAI_API_KEY
+import threading
+from PIL import Image, ImageChops
+try:
+    import pybase64 as base64  # SIMD-accelerated, same API as the stdlib module
+except ImportError:
+    import base64
+from config import (get_api_key, PNG_COMPRESS_LEVEL, JPEG_QUALITY, JPEG_PIXEL_THRESHOLD,
+                    MAX_UPLOAD_EDGE, LOW_DETAIL_EDGE, MAX_TOKENS, STOP_SEQUENCES, TEMPERATURE,
+                    API_MAX_RETRIES, MODEL, FALLBACK_MODEL)
 
-openai.api_key = OPENAI_API_KEY
+# simplejpeg (libjpeg-turbo bindings that encode straight from an ndarray) and
+# numpy are imported on the first JPEG encode, on a worker thread, so they do
+# not add to startup time.
+numpy = None
+simplejpeg = None
+_simplejpeg_imported = False
 
-def encode_image_to_base64(image):
+# One client per process: the underlying HTTP/2 connection (and its TLS session)
+# is reused across snips instead of being renegotiated on every request.
+_client = None
+_client_lock = threading.Lock()
+
+# Static system instructions sent ahead of every image. Keeping the text
+# identical and placed before the image lets the API reuse its cached prompt prefix.
+VISION_PROMPT = (
+    "Extract all text from the image accurately, then explain any problems or "
+    "questions in it. Format with '### Heading', '## Subheading', '- Item', "
+    "```code``` blocks and **bold**."
+)
+# Routes requests sharing VISION_PROMPT to the same prompt-cache shard. Sent via
+# extra_body, since openai SDKs in the supported range predate the typed parameter.
+# It also versions cached answers, so bump it whenever VISION_PROMPT changes.
+PROMPT_CACHE_KEY = "snip-vision-v2"
+
+# Answers shorter than this, or containing a refusal marker, are escalated to FALLBACK_MODEL.
+MIN_ANSWER_LENGTH = 20
+REFUSAL_MARKERS = ("I cannot", "I can't", "I'm unable", "I am unable")
+
+# Pixels of background kept around the content when a snip is cropped.
+CROP_MARGIN = 4
+
+def crop_to_content(image):
+    """
+    Return the image cropped to the area that differs from its background
+    (the top-left pixel's colour), keeping CROP_MARGIN pixels around it, or the
+    image itself when there is nothing to trim. The comparison runs in Pillow's
+    C code, so it costs far less than encoding the margins would.
+    """
+    if image.mode != "RGB":
+        return image
+    background = Image.new("RGB", image.size, image.getpixel((0, 0)))
+    bbox = ImageChops.difference(image, background).getbbox()
+    if bbox is None:
+        return image
+    left, top, right, bottom = bbox
+    bbox = (max(left - CROP_MARGIN, 0), max(top - CROP_MARGIN, 0),
+            min(right + CROP_MARGIN, image.width), min(bottom + CROP_MARGIN, image.height))
+    if bbox == (0, 0, image.width, image.height):
+        return image
+    logging.info("Cropped snip to content: %s -> %s", image.size, bbox)
+    return image.crop(bbox)
+
+def downscale_for_upload(image):
+    """
+    Return a copy of the image shrunk so its longest edge is at most
+    MAX_UPLOAD_EDGE, or the image itself if it is already small enough.
+    """
+    if max(image.size) <= MAX_UPLOAD_EDGE:
+        return image
+    original_size = image.size
+    image = image.copy()
+    image.thumbnail((MAX_UPLOAD_EDGE, MAX_UPLOAD_EDGE), Image.Resampling.LANCZOS)
+    logging.info("Downscaled image for upload: %s -> %s", original_size, image.size)
+    return image
+
+def get_client():
+    """
+    Return the shared OpenAI client, creating it on first use. The openai and
+    httpx imports (about half a second) are deferred until then so they do not
+    delay the main window.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            from openai import OpenAI
+            http_client = httpx.Client(http2=True, timeout=60,
+                                       limits=httpx.Limits(max_keepalive_connections=4))
+            _client = OpenAI(api_key=get_api_key(), http_client=http_client,
+                             max_retries=API_MAX_RETRIES)
+            atexit.register(_client.close)
+    return _client
+
+def select_image_format(image):
+    """
+    Pick the upload format for a snip: JPEG for captures above
+    JPEG_PIXEL_THRESHOLD pixels, PNG otherwise.
+    """
+    if image.width * image.height > JPEG_PIXEL_THRESHOLD:
+        return "JPEG"
+    return "PNG"
+
+def select_image_detail(image):
     """
-    Convert a PIL image to a base64-encoded PNG string.
+    Pick the vision detail level for a snip: "low" when it fits within
+    LOW_DETAIL_EDGE pixels, "auto" otherwise.
     """
-    buffered = BytesIO()
-    image.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode('utf-8')
+    if max(image.size) <= LOW_DETAIL_EDGE:
+        return "low"
+    return "auto"
 
-def process_image_with_openai(img, base64_image):
+def _load_simplejpeg():
+    """Import simplejpeg and numpy on first use; return simplejpeg, or None if unavailable."""
+    global numpy, simplejpeg, _simplejpeg_imported
+    if not _simplejpeg_imported:
+        _simplejpeg_imported = True
+        try:
+            import numpy
+            import simplejpeg
+        except ImportError:
+            simplejpeg = None
+    return simplejpeg
+
+def _save_image(image, image_format):
+    """
+    Serialize a PIL image in the given format (PNG or JPEG) and return the
+    encoded bytes as a bytes-like object. JPEG goes through simplejpeg when it
+    is installed; Pillow output is returned as a view of its buffer, not a copy.
+    """
+    if image_format == "JPEG":
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if _load_simplejpeg() is not None:
+            return simplejpeg.encode_jpeg(numpy.asarray(image), quality=JPEG_QUALITY, colorspace='RGB')
+        buffered = BytesIO()
+        image.save(buffered, format="JPEG", quality=JPEG_QUALITY, optimize=False)
+    else:
+        buffered = BytesIO()
+        image.save(buffered, format="PNG", compress_level=PNG_COMPRESS_LEVEL, optimize=False)
+    return buffered.getbuffer()
+
+def encode_image_to_base64(image, image_format="PNG"):
+    """
+    Convert a PIL image to a base64-encoded string in the given format
+    (PNG or JPEG).
+    """
+    return base64.b64encode(_save_image(image, image_format)).decode('ascii')
+
+def encode_image_to_data_url(image, image_format="PNG"):
+    """
+    Convert a PIL image to a complete base64 data URL. The header is joined
+    to the encoded bytes before the single decode to str, so the payload is
+    not copied through an intermediate string.
     """
-    Calls the OpenAI API with the provided image data and returns the response text.
+    header = f"data:image/{image_format.lower()};base64,".encode('ascii')
+    encoded = base64.b64encode(_save_image(image, image_format))
+    return (header + encoded).decode('ascii')
+
+def build_messages(data_url, detail="auto"):
+    """
+    Builds the chat messages for a vision request on the image at the given
+    data URL, at the given detail level.
     """
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
-            messages=[
+    return [
+        {
+            "role": "system",
+            "content": VISION_PROMPT
+        },
+        {
+            "role": "user",
+            "content": [
                 {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": (
-                                "Please perform the following tasks:\n"
-                                "1. Analyze the provided image to extract all text accurately.\n"
-                                "2. Examine the extracted text and explain any problems or questions.\n"
-                                "3. Use markdown-like formatting for clarity:\n"
-                                "   - Headings: '### Heading'\n"
-                                "   - Subheadings: '## Subheading'\n"
-                                "   - Lists: '- Item'\n"
-                                "   - Code blocks: ```code```\n"
-                                "   - Inline bold: '**bold**'\n"
-                                "4. Return the final answer in plain text."
-                            )
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{base64_image}"}
-                        }
-                    ]
+                    "type": "image_url",
+                    "image_url": {"url": data_url, "detail": detail}
                 }
-            ],
-            max_tokens=500
-        )
-        answer = response.choices[0].message.content.strip()
-        logging.info("OpenAI response: %s", answer)
-        return answer
-    except Exception as e:
-        error_message = f"Error processing image: {e}"
-        logging.error(error_message)
-        return error_message
+            ]
+        }
+    ]
+
+def should_escalate(answer, model):
+    """
+    Return True if `answer` from `model` looks too weak to show and a larger
+    fallback model is available.
+    """
+    if model == FALLBACK_MODEL:
+        return False
+    return len(answer) < MIN_ANSWER_LENGTH or any(marker in answer for marker in REFUSAL_MARKERS)
+
+def stream_image_with_openai(data_url, model=MODEL, detail="auto"):
+    """
+    Calls the OpenAI API with streaming enabled and yields the response text
+    in chunks as they arrive. Errors are raised to the caller. Closing the
+    generator early closes the HTTP stream, so an abandoned answer stops
+    downloading.
+    """
+    response = get_client().chat.completions.create(
+        model=model,
+        messages=build_messages(data_url, detail),
+        max_tokens=MAX_TOKENS,
+        stop=STOP_SEQUENCES,
+        temperature=TEMPERATURE,
+        extra_body={"prompt_cache_key": PROMPT_CACHE_KEY},
+        stream=True
+    )
+    with response:
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from PIL import Image
+from cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmpdir.name, "cache.sqlite3"), ttl=60, memory_size=2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        key = ResponseCache.image_key(Image.new('RGB', (4, 4), 'red'))
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "answer")
+        self.assertEqual(self.cache.get(key), "answer")
+
+    def test_expired_entries_miss(self):
+        key = ResponseCache.image_key(Image.new('RGB', (4, 4), 'red'))
+        with mock.patch("time.time", return_value=1000):
+            self.cache.put(key, "old answer")
+        with mock.patch("time.time", return_value=1061):
+            self.assertIsNone(self.cache.get(key))
+
+    def test_expired_entries_pruned_on_open(self):
+        with mock.patch("time.time", return_value=1000):
+            self.cache.put("old", "old answer")
+        self.cache.put("new", "new answer")
+        ResponseCache(self.cache.path, ttl=60)
+        with self.cache._connect() as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM responses")]
+        self.assertEqual(keys, ["new"])
+
+    def test_unwritable_path_falls_back_to_memory(self):
+        cache = ResponseCache(os.path.join(self.tmpdir.name, "missing", "cache.sqlite3"), ttl=60)
+        cache.put("key", "answer")
+        self.assertEqual(cache.get("key"), "answer")
+
+    def test_memory_hit_skips_database(self):
+        self.cache.put("key", "answer")
+        with mock.patch.object(self.cache, "_connect", side_effect=AssertionError):
+            self.assertEqual(self.cache.get("key"), "answer")
+
+    def test_memory_is_lru_bounded(self):
+        for key in ("a", "b", "c"):
+            self.cache.put(key, key.upper())
+        self.assertEqual(list(self.cache.memory), ["b", "c"])
+        self.assertEqual(self.cache.get("a"), "A")  # Still on disk.
+
+    def test_image_key_depends_on_pixels(self):
+        red = Image.new('RGB', (4, 4), 'red')
+        self.assertEqual(ResponseCache.image_key(red), ResponseCache.image_key(red.copy()))
+        self.assertNotEqual(ResponseCache.image_key(red), ResponseCache.image_key(Image.new('RGB', (4, 4), 'blue')))
+
+    def test_image_key_depends_on_context(self):
+        red = Image.new('RGB', (4, 4), 'red')
+        self.assertNotEqual(ResponseCache.image_key(red, "gpt-4o-mini|v1"),
+                            ResponseCache.image_key(red, "gpt-4o|v1"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import os
+import unittest
+from unittest import mock
+from config import get_api_key
+
+class TestConfig(unittest.TestCase):
+    def tearDown(self):
+        get_api_key.cache_clear()
+
+    def test_api_key_read_from_environment(self):
+        get_api_key.cache_clear()
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}):
+            self.assertEqual(get_api_key(), "sk-test")
+
+    def test_missing_api_key_raises_on_use(self):
+        get_api_key.cache_clear()
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
+            with self.assertRaises(ValueError):
+                get_api_key()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,85 @@
-from utils import set_dpi_awareness
-from ui import SnippingToolApp
-import tkinter as tk
-
-def main():
-    set_dpi_awareness()
-    root = tk.Tk()
-    app = SnippingToolApp(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-    main()
+import unittest
+from formatter import StreamFormatter, _coalesce, tokenize_markdown, format_and_insert_text, insert_bold_text
+
+class FakeText:
+    """Records insert calls in place of a Tk Text widget."""
+    def __init__(self):
+        self.inserts = []
+
+    def delete(self, *args):
+        self.inserts = []
+
+    def insert(self, index, *args):
+        self.inserts.append(args)
+
+class TestFormatter(unittest.TestCase):
+    def test_tokenize_blocks(self):
+        content = "### Title\n## Sub\n- item\nplain **bold** text"
+        self.assertEqual(tokenize_markdown(content), [
+            ("Title", ("heading",)),
+            ("\n", ()),
+            ("Sub", ("subheading",)),
+            ("\n", ()),
+            ("- item", ("list",)),
+            ("\nplain ", ()),
+            ("bold", ("bold",)),
+            (" text\n", ()),
+        ])
+
+    def test_tokenize_code_block(self):
+        content = "```python\nx = 1\n### not a heading\n```\nafter"
+        self.assertEqual(tokenize_markdown(content), [
+            ("x = 1\n### not a heading\n", ("code",)),
+            ("after\n", ()),
+        ])
+
+    def test_unclosed_code_block_is_dropped(self):
+        self.assertEqual(tokenize_markdown("before\n```\npartial"), [("before\n", ())])
+
+    def test_format_and_insert_text(self):
+        widget = FakeText()
+        format_and_insert_text(widget, "### **Bold** heading")
+        self.assertEqual(widget.inserts, [
+            ("Bold", ("heading", "bold"), " heading", ("heading",), "\n", ()),
+        ])
+
+    def test_format_empty_content(self):
+        widget = FakeText()
+        format_and_insert_text(widget, "")
+        self.assertEqual(widget.inserts, [])
+
+    def test_stream_formatter_matches_full_render(self):
+        content = "### Title\n```\ncode **x**\n```\n- **a** b\n"
+        formatter = StreamFormatter()
+        segments = []
+        for i in range(0, len(content), 3):
+            segments.extend(formatter.feed(content[i:i + 3]))
+        self.assertEqual("".join(text for text, _ in segments),
+                         "".join(text for text, _ in tokenize_markdown(content)))
+        self.assertIn(("code **x**\n", ("code",)), segments)
+        self.assertIn(("a", ("list", "bold")), segments)
+
+    def test_stream_formatter_language_tagged_fence(self):
+        content = "Intro\n```python\nx = 1\n### y\n```\nAfter **b**\n- item\n"
+        formatter = StreamFormatter()
+        segments = []
+        for i in range(0, len(content), 4):
+            segments.extend(formatter.feed(content[i:i + 4]))
+        self.assertEqual(_coalesce(segments), tokenize_markdown(content))
+        self.assertIn(("x = 1\n### y\n", ("code",)), _coalesce(segments))
+        self.assertFalse(formatter.in_code_block)
+
+    def test_stream_formatter_holds_partial_line(self):
+        formatter = StreamFormatter()
+        self.assertEqual(formatter.feed("## Par"), [])
+        self.assertEqual(formatter.feed("tial\n"), [("Partial", ("subheading",)), ("\n", ())])
+
+    def test_insert_bold_text(self):
+        widget = FakeText()
+        insert_bold_text(widget, "- a **b** c", "list")
+        self.assertEqual(widget.inserts, [
+            ("- a ", ("list",), "b", ("list", "bold"), " c", ("list",)),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
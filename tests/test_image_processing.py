@@ -1,6 +1,12 @@
 import unittest
+from unittest import mock
 from PIL import Image
-from image_processing import encode_image_to_base64
+import base64
+from config import API_MAX_RETRIES, MAX_UPLOAD_EDGE
+import image_processing
+from image_processing import (CROP_MARGIN, crop_to_content, downscale_for_upload, encode_image_to_base64,
+                              encode_image_to_data_url, get_client, select_image_detail, select_image_format,
+                              should_escalate, stream_image_with_openai)
 
 class TestImageProcessing(unittest.TestCase):
     def test_encode_image(self):
@@ -10,5 +16,72 @@ class TestImageProcessing(unittest.TestCase):
         self.assertIsInstance(encoded, str)
         self.assertTrue(len(encoded) > 0)
 
+    def test_encode_data_url(self):
+        img = Image.new('RGB', (10, 10), color='red')
+        url = encode_image_to_data_url(img)
+        self.assertTrue(url.startswith("data:image/png;base64,"))
+        self.assertEqual(url.split(",", 1)[1], encode_image_to_base64(img))
+
+    def test_large_images_use_jpeg(self):
+        self.assertEqual(select_image_format(Image.new('RGB', (10, 10))), "JPEG")
+        with mock.patch("image_processing.JPEG_PIXEL_THRESHOLD", 1_000_000):
+            self.assertEqual(select_image_format(Image.new('RGB', (10, 10))), "PNG")
+        large = Image.new('RGBA', (1200, 1000), color='blue')
+        self.assertEqual(select_image_format(large), "JPEG")
+        encoded = encode_image_to_base64(large, "JPEG")
+        self.assertTrue(base64.b64decode(encoded).startswith(b"\xff\xd8"))
+
+    def test_downscale_for_upload(self):
+        small = Image.new('RGB', (100, 50))
+        self.assertIs(downscale_for_upload(small), small)
+        large = Image.new('RGB', (4096, 1000))
+        scaled = downscale_for_upload(large)
+        self.assertEqual(max(scaled.size), MAX_UPLOAD_EDGE)
+        self.assertEqual(large.size, (4096, 1000))
+
+    def test_crop_to_content(self):
+        img = Image.new('RGB', (200, 100), color='white')
+        img.paste((0, 0, 0), (50, 40, 70, 60))
+        cropped = crop_to_content(img)
+        self.assertEqual(cropped.size, (20 + 2 * CROP_MARGIN, 20 + 2 * CROP_MARGIN))
+        blank = Image.new('RGB', (200, 100), color='white')
+        self.assertIs(crop_to_content(blank), blank)
+
+    def test_small_snips_use_low_detail(self):
+        self.assertEqual(select_image_detail(Image.new('RGB', (512, 200))), "low")
+        self.assertEqual(select_image_detail(Image.new('RGB', (513, 200))), "auto")
+
+    def test_should_escalate(self):
+        self.assertTrue(should_escalate("", "gpt-4o-mini"))
+        self.assertTrue(should_escalate("I cannot read the text in this image.", "gpt-4o-mini"))
+        self.assertFalse(should_escalate("### Answer\nThe result is 42.", "gpt-4o-mini"))
+        self.assertFalse(should_escalate("", "gpt-4o"))
+
+    def test_client_retries_transient_errors(self):
+        with mock.patch.object(image_processing, "_client", None), \
+                mock.patch("image_processing.get_api_key", return_value="sk-test"), \
+                mock.patch("httpx.Client"), \
+                mock.patch("openai.OpenAI") as openai_client, \
+                mock.patch("atexit.register"):
+            get_client()
+        self.assertEqual(openai_client.call_args.kwargs["max_retries"], API_MAX_RETRIES)
+
+    def test_stream_yields_deltas(self):
+        def chunk(content):
+            return mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=content))])
+        chunks = [chunk("Hello"), chunk(None), chunk(" world")]
+        response = mock.MagicMock()
+        response.__enter__.return_value = response
+        response.__iter__.return_value = iter(chunks)
+        client = mock.Mock()
+        client.chat.completions.create.return_value = response
+        with mock.patch("image_processing.get_client", return_value=client):
+            deltas = list(stream_image_with_openai("data:image/png;base64,abc"))
+        create = client.chat.completions.create
+        self.assertEqual(deltas, ["Hello", " world"])
+        self.assertTrue(create.call_args.kwargs["stream"])
+        self.assertEqual(create.call_args.kwargs["extra_body"], {"prompt_cache_key": image_processing.PROMPT_CACHE_KEY})
+        response.__exit__.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
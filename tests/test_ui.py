@@ -1,6 +1,12 @@
+import queue
+import sys
+import threading
 import unittest
+from unittest import mock
 import tkinter as tk
-from ui import SnippingToolApp
+from PIL import Image
+from formatter import StreamFormatter
+from ui import HIDE_SETTLE_MS, SelectionWindow, SnippingToolApp
 
 class TestUI(unittest.TestCase):
     def setUp(self):
@@ -15,5 +21,221 @@ class TestUI(unittest.TestCase):
         self.assertIsNotNone(self.app.result_text)
         self.assertIsNotNone(self.app.image_label)
 
+class TestStreamBatching(unittest.TestCase):
+    """Exercises the streaming helpers without a display."""
+    def setUp(self):
+        self.app = SnippingToolApp.__new__(SnippingToolApp)
+        self.app.master = mock.Mock()
+        self.app.result_text = mock.Mock()
+        self.app.request_id = 2
+        self.app.stream_queue = queue.Queue()
+        self.app.flush_lock = threading.Lock()
+        self.app.flush_scheduled = False
+        self.app.stream_formatter = StreamFormatter()
+
+    def test_chunks_are_flushed_in_one_insert(self):
+        self.app.queue_text(1, "stale")
+        self.app.queue_text(2, "### Hel")
+        self.app.queue_text(2, "lo\nwor")
+        self.assertEqual(self.app.master.after.call_count, 1)
+        self.app.flush_text()
+        self.app.result_text.insert.assert_called_once_with(tk.END, "Hello", ("heading",), "\n", ())
+        self.assertFalse(self.app.flush_scheduled)
+
+    def test_final_answer_discards_pending_chunks(self):
+        self.app.queue_text(2, "raw\n")
+        with mock.patch("ui.format_and_insert_text") as render:
+            self.app.show_answer(2, "formatted")
+        render.assert_called_once_with(self.app.result_text, "formatted")
+        self.app.flush_text()
+        self.app.result_text.insert.assert_not_called()
+
+    def test_superseded_stream_is_closed(self):
+        closed = []
+        def stream(data_url, model, detail):
+            try:
+                yield "first"
+                self.app.request_id = 3  # A newer snip starts mid-stream.
+                yield "second"
+            finally:
+                closed.append(True)
+        with mock.patch("ui.stream_image_with_openai", stream):
+            self.assertIsNone(self.app.stream_answer("data:", 2, "model"))
+        self.assertEqual(closed, [True])
+        self.assertEqual(self.app.stream_queue.qsize(), 1)
+
+class TestCaptureFlow(unittest.TestCase):
+    """Exercises the snip state machine without a display."""
+    def setUp(self):
+        self.app = SnippingToolApp.__new__(SnippingToolApp)
+        self.app.master = mock.Mock()
+        self.app.is_snipping = False
+        self.app.hide_timeout = None
+        self.app.transitions_disabled = True
+
+    def test_overlay_opens_once_after_unmap(self):
+        self.app.capture_area()
+        self.app.master.withdraw.assert_called_once()
+        self.app.on_main_hidden(mock.Mock(widget=self.app.master))
+        self.app.on_main_hidden()  # Timeout firing late is ignored.
+        self.app.master.after_idle.assert_called_once_with(self.app.open_selection)
+
+    def test_desktop_grab_waits_for_hide_animation(self):
+        self.app.transitions_disabled = False
+        self.app.capture_area()
+        with mock.patch("ui.grab_screen") as grab:
+            self.app.on_main_hidden(mock.Mock(widget=self.app.master))
+            grab.assert_not_called()
+        self.app.master.after_idle.assert_not_called()
+        self.app.master.after.assert_called_with(HIDE_SETTLE_MS, self.app.open_selection)
+
+    def test_frozen_selection_skips_regrab(self):
+        image = Image.new('RGB', (4, 4))
+        with mock.patch.object(self.app, "finish_capture") as finish:
+            self.app.on_selection_done((0, 0, 4, 4), image)
+        finish.assert_called_once_with((0, 0, 4, 4), image)
+        self.app.master.after.assert_not_called()
+
+    def test_close_stops_pending_work(self):
+        self.app.request_id = 5
+        self.app.selection = None
+        with mock.patch("ui._executor") as executor, mock.patch("ui.close_screen_capture"):
+            self.app.close()
+        self.assertEqual(self.app.request_id, 6)
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        self.app.master.destroy.assert_called_once()
+
+    def test_capture_ignored_while_snipping(self):
+        self.app.is_snipping = True
+        self.app.capture_area()
+        self.app.master.withdraw.assert_not_called()
+
+class TestSelectionDrag(unittest.TestCase):
+    """Drag handling on a SelectionWindow built without a display."""
+    def setUp(self):
+        self.window = SelectionWindow.__new__(SelectionWindow)
+        self.window.top = mock.Mock()
+        self.window.canvas = mock.Mock()
+        self.window.set_coord_text = mock.Mock()
+        self.window.rect = 1
+        self.window.coord_bg, self.window.coord_text = 2, 3
+        self.window.frozen = False
+        self.window.can_freeze = False
+        self.window.screenshot = None
+        self.window.background = None
+        self.window.background_item = 4
+        self.window.shades = [10, 11, 12, 13]
+        self.window.pending_move = None
+        self.window.move_job = None
+        self.window.label_time = 0.0
+        self.window.on_button_press(mock.Mock(x=10, y=10))
+        self.window.canvas.reset_mock()
+        self.window.set_coord_text.reset_mock()
+
+    def test_motion_events_are_coalesced(self):
+        for x in range(11, 20):
+            self.window.on_move_press(mock.Mock(x=x, y=x))
+        self.window.top.after_idle.assert_called_once()
+        self.window.flush_move()
+        self.window.canvas.coords.assert_called_once_with(1, 10, 10, 19, 19)
+        self.window.set_coord_text.assert_called_once()
+
+    def test_label_skips_small_moves(self):
+        self.window.on_move_press(mock.Mock(x=11, y=10))
+        self.window.flush_move()
+        self.window.set_coord_text.assert_not_called()
+
+    def test_label_updates_are_rate_limited(self):
+        with mock.patch("ui.time.monotonic", return_value=100.0):
+            self.window.on_move_press(mock.Mock(x=20, y=20))
+            self.window.flush_move()
+            self.window.on_move_press(mock.Mock(x=30, y=30))
+            self.window.flush_move()
+        self.assertEqual(self.window.canvas.coords.call_count, 2)
+        self.window.set_coord_text.assert_called_once()
+
+    def test_overlay_is_hidden_and_reshown(self):
+        on_done = self.window.on_done = mock.Mock()
+        self.window.on_escape(None)
+        self.window.top.withdraw.assert_called_once()
+        self.window.top.destroy.assert_not_called()
+        on_done.assert_called_once_with(None, None)
+        self.window.bbox = (1, 2, 3, 4)
+        self.window.show(on_done)
+        self.assertIsNone(self.window.bbox)
+        self.window.canvas.itemconfigure.assert_any_call(1, state='hidden')
+        self.window.top.deiconify.assert_called_once()
+        self.window.top.update.assert_not_called()
+
+    def test_failed_screenshot_falls_back_to_translucent(self):
+        self.window.can_freeze = True
+        self.window.screen_x = self.window.screen_y = 0
+        self.window.screen_width, self.window.screen_height = 100, 80
+        with mock.patch("ui.grab_screen", side_effect=RuntimeError("no display")):
+            self.window.show(mock.Mock())
+        self.assertFalse(self.window.frozen)
+        self.assertIsNone(self.window.screenshot)
+        self.window.top.attributes.assert_called_with('-alpha', 0.3)
+        self.window.canvas.itemconfigure.assert_any_call(10, state='hidden')
+        self.window.top.deiconify.assert_called_once()
+
+    def test_shades_cover_outside_selection(self):
+        self.window.frozen = True
+        self.window.shades = [10, 11, 12, 13]
+        self.window.screen_width, self.window.screen_height = 100, 80
+        self.window.shade_outside(50, 40, 20, 30)
+        self.window.canvas.coords.assert_has_calls([
+            mock.call(10, 0, 0, 100, 30), mock.call(11, 0, 40, 100, 80),
+            mock.call(12, 0, 30, 20, 40), mock.call(13, 50, 30, 100, 40)])
+
+    def test_escape_cancels_pending_redraw(self):
+        self.window.on_done = None
+        self.window.on_move_press(mock.Mock(x=30, y=30))
+        self.window.on_escape(None)
+        self.window.top.after_cancel.assert_called_once_with(self.window.top.after_idle.return_value)
+        self.assertIsNone(self.window.move_job)
+
+    def test_close_tolerates_destroyed_window(self):
+        self.window.top.destroy.side_effect = tk.TclError("bad window path name")
+        self.window.close()
+        self.window.canvas.unbind.assert_any_call("<B1-Motion>")
+
+    def test_coord_text_backing_fits_text(self):
+        window = SelectionWindow.__new__(SelectionWindow)
+        window.canvas = mock.Mock()
+        window.canvas.bbox.return_value = (12, 12, 80, 26)
+        window.coord_text, window.coord_bg = 2, 3
+        window.set_coord_text("Start: (1, 2)")
+        window.canvas.itemconfigure.assert_any_call(2, text="Start: (1, 2)")
+        window.canvas.coords.assert_called_once_with(3, 10, 10, 82, 28)
+
+    def test_release_reports_bbox_once(self):
+        self.window.screen_x = self.window.screen_y = 0
+        self.window.bbox = None
+        on_done = self.window.on_done = mock.Mock()
+        self.window.on_button_release(mock.Mock(x=50, y=40))
+        self.window.on_escape(None)
+        on_done.assert_called_once_with((10, 10, 50, 40), None)
+
+    def test_selection_is_cropped_from_screenshot(self):
+        self.window.screen_x, self.window.screen_y = -100, 0
+        self.window.screenshot = Image.new('RGB', (200, 100), 'white')
+        self.window.screenshot.paste((255, 0, 0), (110, 10, 150, 40))
+        on_done = self.window.on_done = mock.Mock()
+        self.window.on_button_release(mock.Mock(x=50, y=40))
+        bbox, image = on_done.call_args.args
+        self.assertEqual(bbox, (-90, 10, -50, 40) if sys.platform.startswith('win') else (10, 10, 50, 40))
+        self.assertEqual(image.size, (40, 30))
+        self.assertIsNone(self.window.screenshot)
+
+    def test_cleanup_releases_background(self):
+        self.window.screen_x = self.window.screen_y = 0
+        self.window.background = mock.Mock()
+        self.window.on_done = mock.Mock()
+        self.window.on_escape(None)
+        self.assertIsNone(self.window.background)
+        self.window.canvas.itemconfigure.assert_any_call(4, image='')
+
+
 if __name__ == '__main__':
     unittest.main()
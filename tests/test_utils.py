@@ -0,0 +1,41 @@
+import unittest
+from unittest import mock
+import utils
+
+class TestGrabScreen(unittest.TestCase):
+    def test_grab_screen_converts_bgra(self):
+        raw = mock.Mock(size=(2, 1), bgra=bytes([10, 20, 30, 255, 40, 50, 60, 255]))
+        grabber = mock.Mock()
+        grabber.grab.return_value = raw
+        with mock.patch.object(utils, "dxcam", None), \
+                mock.patch.object(utils, "mss", mock.Mock()), \
+                mock.patch.object(utils, "_screen_grabber", grabber):
+            img = utils.grab_screen((5, 6, 7, 7))
+        grabber.grab.assert_called_once_with({"left": 5, "top": 6, "width": 2, "height": 1})
+        self.assertEqual(img.mode, "RGB")
+        self.assertEqual(img.getpixel((1, 0)), (60, 50, 40))
+
+    def test_dxcam_falls_back_outside_primary_output(self):
+        camera = mock.Mock(width=1920, height=1080)
+        grabber = mock.Mock()
+        grabber.grab.return_value = mock.Mock(size=(1, 1), bgra=bytes(4))
+        with mock.patch.object(utils, "dxcam", mock.Mock()), \
+                mock.patch.object(utils, "_camera", camera), \
+                mock.patch.object(utils, "mss", mock.Mock()), \
+                mock.patch.object(utils, "_screen_grabber", grabber):
+            utils.grab_screen((-100, 0, -99, 1))
+        camera.grab.assert_not_called()
+        grabber.grab.assert_called_once()
+
+    def test_close_releases_backends(self):
+        camera, grabber = mock.Mock(), mock.Mock()
+        with mock.patch.object(utils, "_camera", camera), \
+                mock.patch.object(utils, "_screen_grabber", grabber):
+            utils.close_screen_capture()
+            self.assertIsNone(utils._camera)
+            self.assertIsNone(utils._screen_grabber)
+        camera.release.assert_called_once()
+        grabber.close.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,33 +1,71 @@
 import sys
+import queue
+import threading
 import time
 import tkinter as tk
-from PIL import ImageGrab, Image, ImageTk
+import tkinter.font as tkfont
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from PIL import Image, ImageTk
 import logging
-from utils import get_virtual_screen_rect
-from image_processing import encode_image_to_base64, process_image_with_openai
-from formatter import format_and_insert_text
-from config import DISPLAY_SIZE, TEXT_WIDGET_CONFIG
+from utils import (close_screen_capture, disable_window_transitions, get_virtual_screen_rect, grab_screen,
+                   open_screen_capture)
+from image_processing import (PROMPT_CACHE_KEY, crop_to_content, downscale_for_upload, encode_image_to_data_url,
+                              get_client, select_image_detail, select_image_format, should_escalate,
+                              stream_image_with_openai)
+from formatter import StreamFormatter, format_and_insert_text, insert_segments
+from cache import ResponseCache
+from config import (DISPLAY_SIZE, TEXT_WIDGET_CONFIG, CACHE_PATH, CACHE_TTL_SECONDS,
+                    CACHE_MEMORY_ENTRIES, DEBUG_CAPTURE,
+                    MODEL, FALLBACK_MODEL, TEMPERATURE, STREAM_FLUSH_MS)
+
+# Time given to the window manager to finish hiding the main window (e.g. a
+# fade-out animation) before the desktop is captured, when transitions could
+# not be disabled.
+HIDE_SETTLE_MS = 200
+
+# Minimum interval, in seconds, between coordinate label updates while dragging (~30 Hz).
+LABEL_INTERVAL = 1 / 30
+
+# Worker pool for image encoding and Vision API requests, keeping the Tk thread free.
+_executor = ThreadPoolExecutor(max_workers=2)
+
+def get_screen_rect(master):
+    """
+    Return (x, y, width, height) of the area the selection overlay covers:
+    the whole virtual screen on Windows, the primary screen elsewhere.
+    """
+    if sys.platform.startswith('win'):
+        virtual_screen = get_virtual_screen_rect()
+        logging.info("Virtual screen dimensions: %s", virtual_screen)
+        return virtual_screen
+    return (0, 0, master.winfo_screenwidth(), master.winfo_screenheight())
 
 class SelectionWindow:
     """
     A fullscreen overlay that allows the user to drag a rectangle
-    to select an area of the screen.
+    to select an area of the screen. It is created hidden and reused: each
+    show() opens it for one selection, and the on_done callback passed to
+    show() receives the selected bbox (or None) once it is hidden again,
+    along with the selected area cropped from the overlay's screenshot (or
+    None when there is no screenshot to crop from).
+
+    The overlay is opaque: it shows a screenshot of the desktop taken when it
+    opens, shaded with stippled rectangles outside the selection, so the
+    compositor never has to alpha-blend a fullscreen window. Tk on macOS
+    cannot draw stipples, so there the overlay stays translucent instead, as
+    it does for any show() whose screenshot fails.
     """
-    def __init__(self, master):
-        if sys.platform.startswith('win'):
-            virtual_screen = get_virtual_screen_rect()
-            self.screen_x, self.screen_y, self.screen_width, self.screen_height = virtual_screen
-            logging.info("Virtual screen dimensions: %s", virtual_screen)
-        else:
-            self.screen_x = 0
-            self.screen_y = 0
-            self.screen_width = master.winfo_screenwidth()
-            self.screen_height = master.winfo_screenheight()
+    def __init__(self, master, screen_rect):
+        self.on_done = None
+        self.screen_x, self.screen_y, self.screen_width, self.screen_height = screen_rect
 
         self.top = tk.Toplevel(master)
+        self.top.withdraw()
         self.top.wm_overrideredirect(True)
         self.top.geometry(f"{self.screen_width}x{self.screen_height}+{self.screen_x}+{self.screen_y}")
-        self.top.attributes('-alpha', 0.3)
+        self.can_freeze = sys.platform != 'darwin'
+        self.frozen = False  # True while the current show() displays a screenshot.
         self.top.attributes('-topmost', True)
         self.top.config(bg='gray')
 
@@ -37,11 +75,28 @@ class SelectionWindow:
 
         self.start_x = None
         self.start_y = None
-        self.rect = None
         self.bbox = None
+        # Desktop screenshot (refreshed on each show) and the four shades
+        # covering the areas above, below, left and right of the selection.
+        self.background = None
+        self.screenshot = None
+        self.background_item = self.canvas.create_image(0, 0, anchor='nw')
+        self.shades = [self.canvas.create_rectangle(0, 0, 0, 0, fill='black', outline='',
+                                                    stipple='gray50', state='hidden')
+                       for _ in range(4)]
+        # The rubber-band rectangle is created once, hidden until the first press.
+        self.rect = self.canvas.create_rectangle(0, 0, 0, 0, outline='red', width=2, state='hidden')
+        # Motion events are coalesced: only the latest position is drawn, once
+        # per idle cycle, and the label is refreshed at most every LABEL_INTERVAL.
+        self.pending_move = None
+        self.move_job = None
+        self.label_xy = None
+        self.label_time = 0.0
 
-        self.coord_label = tk.Label(self.top, bg="white", fg="black")
-        self.coord_label.place(x=10, y=10)
+        # Coordinate readout drawn on the canvas itself, so updating it does not
+        # go through the geometry manager like a Label would.
+        self.coord_bg = self.canvas.create_rectangle(0, 0, 0, 0, fill='white', outline='', state='hidden')
+        self.coord_text = self.canvas.create_text(12, 12, anchor='nw', fill='black', text='')
 
         self.canvas.bind("<ButtonPress-1>", self.on_button_press)
         self.canvas.bind("<B1-Motion>", self.on_move_press)
@@ -49,22 +104,91 @@ class SelectionWindow:
         self.canvas.bind("<Escape>", self.on_escape)
         self.top.bind("<Escape>", self.on_escape)
 
+    def show(self, on_done):
+        """Opens the overlay for a new selection, cleared of the previous one."""
+        self.on_done = on_done
+        self.start_x = None
+        self.start_y = None
+        self.bbox = None
+        self.canvas.itemconfigure(self.rect, state='hidden')
+        self.canvas.itemconfigure(self.coord_bg, state='hidden')
+        self.canvas.itemconfigure(self.coord_text, text='')
+        self.frozen = False
+        if self.can_freeze:
+            self.frozen = True
+            try:
+                self.show_desktop()
+            except Exception as e:
+                self.frozen = False
+                logging.error("Desktop screenshot failed, using a translucent overlay: %s", e)
+        if not self.frozen:
+            self.canvas.itemconfigure(self.background_item, state='hidden')
+            for shade in self.shades:
+                self.canvas.itemconfigure(shade, state='hidden')
+        self.top.attributes('-alpha', 1.0 if self.frozen else 0.3)
+        self.top.deiconify()
         self.top.lift()
         self.top.focus_force()
-        self.top.update()
+
+    def show_desktop(self):
+        """Draws a fresh screenshot of the covered area, fully shaded."""
+        screenshot = grab_screen((self.screen_x, self.screen_y,
+                                  self.screen_x + self.screen_width, self.screen_y + self.screen_height))
+        self.screenshot = screenshot
+        self.background = ImageTk.PhotoImage(screenshot)
+        self.canvas.itemconfigure(self.background_item, image=self.background, state='normal')
+        self.shade_outside(0, 0, 0, 0)
+        for shade in self.shades:
+            self.canvas.itemconfigure(shade, state='normal')
+
+    def shade_outside(self, x0, y0, x1, y1):
+        """Moves the shades so they cover everything outside the (x0, y0, x1, y1) box."""
+        if not self.frozen:
+            return
+        left, right = min(x0, x1), max(x0, x1)
+        top, bottom = min(y0, y1), max(y0, y1)
+        width, height = self.screen_width, self.screen_height
+        boxes = ((0, 0, width, top), (0, bottom, width, height),
+                 (0, top, left, bottom), (right, top, width, bottom))
+        for shade, box in zip(self.shades, boxes):
+            self.canvas.coords(shade, *box)
 
     def on_button_press(self, event):
         self.start_x = event.x
         self.start_y = event.y
-        self.rect = self.canvas.create_rectangle(self.start_x, self.start_y,
-                                                 self.start_x, self.start_y,
-                                                 outline='red', width=2)
-        self.coord_label.config(text=f"Start: ({self.start_x}, {self.start_y})")
+        self.canvas.coords(self.rect, self.start_x, self.start_y, self.start_x, self.start_y)
+        self.canvas.itemconfigure(self.rect, state='normal')
+        self.shade_outside(self.start_x, self.start_y, self.start_x, self.start_y)
+        self.set_coord_text(f"Start: ({self.start_x}, {self.start_y})")
+        self.label_xy = (self.start_x, self.start_y)
 
     def on_move_press(self, event):
-        curX, curY = event.x, event.y
+        self.pending_move = (event.x, event.y)
+        if self.move_job is None:
+            self.move_job = self.top.after_idle(self.flush_move)
+
+    def flush_move(self):
+        """
+        Draws the latest pending drag position. The label skips sub-2px moves
+        and updates no more often than every LABEL_INTERVAL.
+        """
+        self.move_job = None
+        curX, curY = self.pending_move
         self.canvas.coords(self.rect, self.start_x, self.start_y, curX, curY)
-        self.coord_label.config(text=f"Start: ({self.start_x}, {self.start_y}), Current: ({curX}, {curY})")
+        self.shade_outside(self.start_x, self.start_y, curX, curY)
+        lastX, lastY = self.label_xy
+        now = time.monotonic()
+        if (abs(curX - lastX) >= 2 or abs(curY - lastY) >= 2) and now - self.label_time >= LABEL_INTERVAL:
+            self.set_coord_text(f"Start: ({self.start_x}, {self.start_y}), Current: ({curX}, {curY})")
+            self.label_xy = (curX, curY)
+            self.label_time = now
+
+    def set_coord_text(self, text):
+        """Shows `text` in the coordinate readout, fitting its white backing to it."""
+        self.canvas.itemconfigure(self.coord_text, text=text)
+        left, top, right, bottom = self.canvas.bbox(self.coord_text)
+        self.canvas.coords(self.coord_bg, left - 2, top - 2, right + 2, bottom + 2)
+        self.canvas.itemconfigure(self.coord_bg, state='normal')
 
     def on_button_release(self, event):
         end_x, end_y = event.x, event.y
@@ -84,21 +208,48 @@ class SelectionWindow:
             logging.info("Selected area: %s", self.bbox)
         self.cleanup()
 
+    def close(self):
+        """
+        Destroys the overlay for good, e.g. when the app quits. The mouse and
+        key bindings are removed first so Tk drops its references to this object.
+        """
+        self.cancel_move()
+        try:
+            for sequence in ("<ButtonPress-1>", "<B1-Motion>", "<ButtonRelease-1>", "<Escape>"):
+                self.canvas.unbind(sequence)
+            self.top.unbind("<Escape>")
+            self.top.destroy()
+        except tk.TclError as e:
+            logging.debug("Selection overlay already destroyed: %s", e)
+
     def on_escape(self, event):
         self.bbox = None
         self.cleanup()
 
+    def cancel_move(self):
+        """Drops a pending drag redraw, if any."""
+        if self.move_job is not None:
+            self.top.after_cancel(self.move_job)
+            self.move_job = None
+
     def cleanup(self):
-        try:
-            if self.rect:
-                self.canvas.delete(self.rect)
-            self.top.after(10, self.top.destroy)
-        except Exception as e:
-            logging.error("Error during cleanup: %s", e)
-            try:
-                self.top.destroy()
-            except:
-                pass
+        """Hides the overlay for reuse and reports the selection."""
+        self.cancel_move()
+        self.top.withdraw()
+        image = None
+        if self.bbox and self.screenshot is not None:
+            # Crop from what the user saw, not from whatever the screen shows now.
+            left, top, right, bottom = self.bbox
+            image = self.screenshot.crop((left - self.screen_x, top - self.screen_y,
+                                          right - self.screen_x, bottom - self.screen_y))
+        self.screenshot = None
+        # The overlay stays alive between snips; don't pin a full-screen image in it.
+        if self.background is not None:
+            self.canvas.itemconfigure(self.background_item, image='')
+            self.background = None
+        if self.on_done is not None:
+            on_done, self.on_done = self.on_done, None
+            on_done(self.bbox, image)
 
 class SnippingToolApp:
     """
@@ -108,6 +259,16 @@ class SnippingToolApp:
         self.master = master
         master.title("Snipping Tool with OpenAI Vision")
         self.is_snipping = False
+        self.screen_rect = None  # Measured on the first snip, then reused.
+        self.selection = None  # Overlay created on the first snip, then reused.
+        self.hide_timeout = None
+        self.request_id = 0
+        # Streamed chunks queued by workers, flushed into the widget in batches.
+        self.stream_queue = queue.Queue()
+        self.flush_lock = threading.Lock()
+        self.flush_scheduled = False
+        self.stream_formatter = StreamFormatter()
+        self.response_cache = ResponseCache(CACHE_PATH, CACHE_TTL_SECONDS, CACHE_MEMORY_ENTRIES)
 
         # Main frame for image and text display.
         self.main_frame = tk.Frame(master)
@@ -118,6 +279,8 @@ class SnippingToolApp:
         self.image_frame.pack(side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
         self.image_label = tk.Label(self.image_frame, text="Captured Image")
         self.image_label.pack(pady=5)
+        self.photo = None  # Created on first snip, then reused for every later one.
+        self.photo_frame = None
 
         # Text display area.
         self.text_frame = tk.Frame(self.main_frame)
@@ -134,50 +297,239 @@ class SnippingToolApp:
         self.capture_button = tk.Button(master, text="Snip Area", command=self.capture_area)
         self.capture_button.pack(pady=10)
 
+        # Warm up the OpenAI client in the background once the window is up, and
+        # open the screen capture backend on the Tk thread, which does the grabs.
+        master.after_idle(_executor.submit, get_client)
+        master.after_idle(open_screen_capture)
+        master.protocol("WM_DELETE_WINDOW", self.close)
+        # Without a hide animation the window is off screen once <Unmap> arrives.
+        self.transitions_disabled = disable_window_transitions(master)
+
+    def close(self):
+        """Stops pending work, releases the overlay and capture backend, then closes the app."""
+        self.request_id += 1  # Any stream still running sees it is stale and stops.
+        _executor.shutdown(wait=False, cancel_futures=True)
+        if self.selection is not None:
+            self.selection.close()
+        close_screen_capture()
+        self.master.destroy()
+
     def configure_text_tags(self):
-        self.result_text.tag_configure("heading", font=("Helvetica", 14, "bold"))
-        self.result_text.tag_configure("subheading", font=("Helvetica", 12, "bold"))
+        # Named fonts are created once and shared by every tagged run, so Tk
+        # never re-parses a font description while laying out answers.
+        self.fonts = {
+            "heading": tkfont.Font(family="Helvetica", size=14, weight="bold"),
+            "subheading": tkfont.Font(family="Helvetica", size=12, weight="bold"),
+            "code": tkfont.Font(family="Courier", size=10),
+            "bold": tkfont.Font(family="Helvetica", size=10, weight="bold"),
+        }
+        self.result_text.tag_configure("heading", font=self.fonts["heading"])
+        self.result_text.tag_configure("subheading", font=self.fonts["subheading"])
         self.result_text.tag_configure("list", lmargin1=20, lmargin2=40)
-        self.result_text.tag_configure("code", font=("Courier", 10), background="#f0f0f0")
-        self.result_text.tag_configure("bold", font=("Helvetica", 10, "bold"))
+        self.result_text.tag_configure("code", font=self.fonts["code"], background="#f0f0f0")
+        self.result_text.tag_configure("bold", font=self.fonts["bold"])
 
     def display_image(self, image):
         """
-        Resize and display the captured image.
+        Resize and display the captured image. The captured image itself is
+        left untouched so it can still be sent for analysis at full resolution.
         """
-        image.thumbnail(DISPLAY_SIZE)
-        photo = ImageTk.PhotoImage(image)
-        self.image_label.config(image=photo)
-        self.image_label.image = photo  # Prevent garbage collection.
+        scale = max(image.width / DISPLAY_SIZE[0], image.height / DISPLAY_SIZE[1])
+        if scale > 1:
+            # A fast integer box reduce brings large captures to within 2x of the
+            # preview size; BILINEAR is plenty for the final step of a preview.
+            size = (max(1, round(image.width / scale)), max(1, round(image.height / scale)))
+            factor = int(scale // 2)
+            if factor > 1:
+                image = image.reduce(factor)
+            image = image.resize(size, Image.Resampling.BILINEAR)
+        if self.photo is None:
+            # One DISPLAY_SIZE photo and one RGB frame back the label for the app's
+            # lifetime; later snips paste into them instead of allocating new images.
+            self.photo = ImageTk.PhotoImage("RGB", DISPLAY_SIZE)
+            self.image_label.config(image=self.photo)
+            red, green, blue = self.image_label.winfo_rgb(self.image_label.cget("bg"))
+            self.photo_background = (red >> 8, green >> 8, blue >> 8)
+            self.photo_frame = Image.new("RGB", DISPLAY_SIZE)
+        self.photo_frame.paste(self.photo_background, (0, 0) + DISPLAY_SIZE)
+        self.photo_frame.paste(image, ((DISPLAY_SIZE[0] - image.width) // 2,
+                                       (DISPLAY_SIZE[1] - image.height) // 2))
+        self.photo.paste(self.photo_frame)
 
     def process_image(self, img):
-        base64_image = encode_image_to_base64(img)
-        answer = process_image_with_openai(img, base64_image)
-        format_and_insert_text(self.result_text, answer)
+        """
+        Clears the text widget and hands the image to the worker pool, which
+        encodes it and streams the OpenAI response back into the widget.
+        """
+        self.request_id += 1
+        self.stream_formatter = StreamFormatter()
+        self.result_text.delete(1.0, tk.END)
+        _executor.submit(self.analyze_image, img, self.request_id)
+
+    def analyze_image(self, img, request_id):
+        """
+        Runs on a worker thread. Chunks are rendered line by line as they arrive;
+        once the stream closes the full answer is re-rendered in one pass.
+        All widget access is marshalled to the Tk thread via `after`.
+        """
+        try:
+            img = downscale_for_upload(crop_to_content(img))
+            # Keyed on the pixels (plus the settings that shape the answer), so a
+            # repeat snip skips encoding as well as the API call.
+            cache_key = ResponseCache.image_key(img, f"{MODEL}|{PROMPT_CACHE_KEY}|{TEMPERATURE}")
+            answer = self.response_cache.get(cache_key)
+            if answer is not None:
+                logging.info("Using cached response for %s", cache_key)
+            else:
+                data_url = encode_image_to_data_url(img, select_image_format(img))
+                logging.info("Encoded image: %d bytes", len(data_url))
+                detail = select_image_detail(img)
+                answer = self.stream_answer(data_url, request_id, MODEL, detail)
+                if answer is not None and should_escalate(answer, MODEL):
+                    logging.info("Escalating to %s", FALLBACK_MODEL)
+                    self.master.after(0, self.clear_text, request_id)
+                    answer = self.stream_answer(data_url, request_id, FALLBACK_MODEL, detail)
+                if answer is None:
+                    return
+                self.response_cache.put(cache_key, answer)
+        except Exception as e:
+            answer = f"Error processing image: {e}"
+            logging.error(answer)
+        self.master.after(0, self.show_answer, request_id, answer)
+
+    def stream_answer(self, data_url, request_id, model, detail="auto"):
+        """
+        Streams an answer from `model`, queueing each chunk for the text widget
+        as it arrives, and returns the full answer text. Returns None, closing
+        the stream, once a newer snip has superseded this request, so the worker
+        is free for the new one.
+        """
+        chunks = []
+        with closing(stream_image_with_openai(data_url, model, detail)) as stream:
+            for delta in stream:
+                if request_id != self.request_id:
+                    logging.info("Request %s superseded, closing its stream", request_id)
+                    return None
+                chunks.append(delta)
+                self.queue_text(request_id, delta)
+        answer = "".join(chunks).strip()
+        logging.info("OpenAI response (%s): %s", model, answer)
+        return answer
+
+    def queue_text(self, request_id, text):
+        """
+        Called from worker threads. Queues streamed text and schedules a flush
+        unless one is already pending, so bursts of chunks cost one Tk insert.
+        """
+        self.stream_queue.put((request_id, text))
+        with self.flush_lock:
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        self.master.after(STREAM_FLUSH_MS, self.flush_text)
+
+    def drain_text(self):
+        """Remove all queued text and return the parts for the current snip."""
+        parts = []
+        while True:
+            try:
+                request_id, text = self.stream_queue.get_nowait()
+            except queue.Empty:
+                return parts
+            if request_id == self.request_id:
+                parts.append(text)
+
+    def flush_text(self):
+        """
+        Formats all queued streamed text and appends the completed lines with a
+        single insert. A trailing partial line waits for the next flush.
+        """
+        with self.flush_lock:
+            self.flush_scheduled = False
+        parts = self.drain_text()
+        if parts:
+            insert_segments(self.result_text, self.stream_formatter.feed("".join(parts)))
+
+    def clear_text(self, request_id):
+        """Clear the text widget, unless a newer snip has superseded this one."""
+        if request_id == self.request_id:
+            self.drain_text()
+            self.stream_formatter = StreamFormatter()
+            self.result_text.delete(1.0, tk.END)
+
+    def show_answer(self, request_id, answer):
+        """Render the final formatted answer, unless a newer snip has superseded this one."""
+        if request_id == self.request_id:
+            self.drain_text()  # Superseded by the formatted answer.
+            format_and_insert_text(self.result_text, answer)
 
     def capture_area(self):
         """
-        Hides the main window, lets the user select an area via a fullscreen overlay,
-        captures that area, and then processes the image.
+        Hides the main window and opens the selection overlay as soon as the
+        window reports it is unmapped (or after a short timeout, in case no
+        <Unmap> arrives). The snip flow continues through event and `after`
+        callbacks so the Tk event loop never blocks.
         """
         if self.is_snipping:
             return
         self.is_snipping = True
+        self.master.bind("<Unmap>", self.on_main_hidden)
+        self.hide_timeout = self.master.after(500, self.on_main_hidden)
+        self.master.withdraw()
+
+    def on_main_hidden(self, event=None):
+        """Opens the selection overlay once the main window is hidden (runs once per snip)."""
+        if event is not None and event.widget is not self.master:
+            return  # <Unmap> bubbling up from a child widget.
+        if self.hide_timeout is None:
+            return
+        self.master.after_cancel(self.hide_timeout)
+        self.hide_timeout = None
+        self.master.unbind("<Unmap>")
+        if self.transitions_disabled:
+            self.master.after_idle(self.open_selection)
+        else:
+            # The window may still be fading out; let it go before the desktop is grabbed.
+            self.master.after(HIDE_SETTLE_MS, self.open_selection)
+
+    def open_selection(self):
+        """
+        Opens the fullscreen selection overlay. Control returns to the main
+        loop right away; on_selection_done continues the snip when it closes.
+        """
         try:
-            self.master.withdraw()
-            self.master.update()
-            time.sleep(0.3)
-            selection = SelectionWindow(self.master)
-            self.master.wait_window(selection.top)
-            time.sleep(0.1)
-            self.master.deiconify()
-            self.master.update()
-            if selection.bbox:
+            if self.screen_rect is None:
+                self.screen_rect = get_screen_rect(self.master)
+            if self.selection is None:
+                self.selection = SelectionWindow(self.master, self.screen_rect)
+            self.selection.show(self.on_selection_done)
+        except Exception as e:
+            logging.error("Error during area selection: %s", e)
+            self.finish_capture(None)
+
+    def on_selection_done(self, bbox, image):
+        """
+        Finishes the snip with the image cropped from the overlay's screenshot,
+        or otherwise gives the overlay time to vanish before grabbing the screen.
+        """
+        if image is not None:
+            self.finish_capture(bbox, image)
+        else:
+            self.master.after(100, self.finish_capture, bbox)
+
+    def finish_capture(self, bbox, img=None):
+        """
+        Captures the selected area while the main window is still hidden (unless
+        `img` already holds it), then restores the window and processes the image.
+        """
+        try:
+            if bbox:
                 try:
-                    from PIL import ImageGrab
-                    logging.info("Capturing area: %s", selection.bbox)
-                    img = ImageGrab.grab(bbox=selection.bbox)
-                    img.save("debug_capture.png")
+                    logging.info("Capturing area: %s", bbox)
+                    if img is None:
+                        img = grab_screen(bbox)
+                    if DEBUG_CAPTURE:
+                        _executor.submit(img.save, "debug_capture.png", compress_level=1)
                     self.display_image(img)
                     self.process_image(img)
                 except Exception as e:
@@ -186,4 +538,5 @@ class SnippingToolApp:
                     self.result_text.delete(1.0, tk.END)
                     self.result_text.insert(tk.END, error_message)
         finally:
+            self.master.deiconify()
             self.is_snipping = False
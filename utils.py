@@ -1,6 +1,15 @@
 import sys
 import ctypes
 import logging
+from PIL import Image, ImageGrab
+try:
+    import mss
+except ImportError:
+    mss = None
+# DXcam (DXGI Desktop Duplication capture) is imported by open_screen_capture
+# rather than here: it pulls in numpy and comtypes, which would delay the window.
+dxcam = None
+_dxcam_imported = not sys.platform.startswith('win')
 
 # Set up logging.
 logging.basicConfig(
@@ -9,13 +18,52 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# user32 entry points, resolved once with explicit signatures.
+if sys.platform.startswith('win'):
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _get_system_metrics = _user32.GetSystemMetrics
+    _get_system_metrics.argtypes = [ctypes.c_int]
+    _get_system_metrics.restype = ctypes.c_int
+    _get_parent = _user32.GetParent
+    _get_parent.argtypes = [ctypes.c_void_p]
+    _get_parent.restype = ctypes.c_void_p
+
+DWMWA_TRANSITIONS_FORCEDISABLED = 3
+
+_dpi_awareness_set = False
+
 def set_dpi_awareness():
-    """Make the process DPI-aware on Windows."""
+    """Make the process DPI-aware on Windows. Repeated calls are no-ops."""
+    global _dpi_awareness_set
+    if _dpi_awareness_set:
+        return
     if sys.platform.startswith('win'):
         try:
             ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Windows 8.1+
         except Exception:
-            ctypes.windll.user32.SetProcessDPIAware()       # Fallback for older Windows
+            _user32.SetProcessDPIAware()                    # Fallback for older Windows
+    _dpi_awareness_set = True
+
+def disable_window_transitions(window):
+    """
+    Turn off DWM's show/hide animations for a Tk toplevel on Windows, so the
+    window is gone from the screen as soon as it is withdrawn. Returns True
+    on success, False elsewhere or if DWM refused.
+    """
+    if not sys.platform.startswith('win'):
+        return False
+    try:
+        set_attribute = ctypes.windll.dwmapi.DwmSetWindowAttribute
+        set_attribute.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_void_p, ctypes.c_uint]
+        set_attribute.restype = ctypes.c_long
+        hwnd = _get_parent(window.winfo_id())  # Tk's wrapper frame is the real top-level window.
+        disabled = ctypes.c_int(1)
+        result = set_attribute(hwnd, DWMWA_TRANSITIONS_FORCEDISABLED,
+                               ctypes.byref(disabled), ctypes.sizeof(disabled))
+    except Exception as e:
+        logging.error("Could not disable window transitions: %s", e)
+        return False
+    return result == 0
 
 def get_virtual_screen_rect():
     """
@@ -23,11 +71,83 @@ def get_virtual_screen_rect():
     on Windows.
     """
     if sys.platform.startswith('win'):
-        user32 = ctypes.windll.user32
-        x = user32.GetSystemMetrics(76)  # SM_XVIRTUALSCREEN
-        y = user32.GetSystemMetrics(77)  # SM_YVIRTUALSCREEN
-        width = user32.GetSystemMetrics(78)  # SM_CXVIRTUALSCREEN
-        height = user32.GetSystemMetrics(79)  # SM_CYVIRTUALSCREEN
+        x = _get_system_metrics(76)  # SM_XVIRTUALSCREEN
+        y = _get_system_metrics(77)  # SM_YVIRTUALSCREEN
+        width = _get_system_metrics(78)  # SM_CXVIRTUALSCREEN
+        height = _get_system_metrics(79)  # SM_CYVIRTUALSCREEN
         return (x, y, width, height)
     else:
         return (0, 0, 800, 600)  # Fallback values for non-Windows systems.
+
+# Persistent capture backends, created once (see open_screen_capture) and reused
+# across snips until close_screen_capture.
+_camera = None
+_screen_grabber = None
+
+def open_screen_capture():
+    """
+    Create the persistent capture backends ahead of the first snip: a DXcam
+    camera on Windows when available, and an mss instance as the fallback.
+    Must be called on the thread that will capture (the Tk thread).
+    """
+    global _camera, _screen_grabber, dxcam, _dxcam_imported
+    if not _dxcam_imported:
+        _dxcam_imported = True
+        try:
+            import dxcam
+        except ImportError:
+            dxcam = None
+    if dxcam is not None and _camera is None:
+        try:
+            # No output_idx: DXcam picks the primary output, which is where
+            # the bbox origin (0, 0) lives. If the primary is not on the first
+            # adapter, create() raises and we stay on mss.
+            _camera = dxcam.create(output_color="RGB")
+        except Exception as e:
+            logging.error("DXcam unavailable, falling back to mss: %s", e)
+            _camera = None
+        if _camera is None:
+            dxcam = None
+    if mss is not None and _screen_grabber is None:
+        _screen_grabber = mss.mss(with_cursor=False)
+
+def close_screen_capture():
+    """Release the persistent capture backends, e.g. when the app quits."""
+    global _camera, _screen_grabber
+    if _camera is not None:
+        _camera.release()
+        _camera = None
+    if _screen_grabber is not None:
+        _screen_grabber.close()
+        _screen_grabber = None
+
+def _grab_with_dxcam(bbox):
+    """
+    Capture the region from the primary output through DXGI Desktop Duplication.
+    Returns None when DXcam cannot serve the request (region off the primary
+    output, no new frame since the last grab), so the caller can fall back to mss.
+    """
+    left, top, right, bottom = bbox
+    if left < 0 or top < 0 or right > _camera.width or bottom > _camera.height:
+        return None
+    frame = _camera.grab(region=bbox)
+    return Image.fromarray(frame) if frame is not None else None
+
+def grab_screen(bbox):
+    """
+    Capture the (left, top, right, bottom) screen region as an RGB PIL image.
+    On Windows the DXcam camera is tried first; otherwise the mss instance is
+    used, falling back to ImageGrab when neither is installed. Backends not yet
+    opened are opened here.
+    """
+    open_screen_capture()
+    if _camera is not None:
+        img = _grab_with_dxcam(bbox)
+        if img is not None:
+            return img
+    if _screen_grabber is None:
+        return ImageGrab.grab(bbox=bbox)
+    left, top, right, bottom = bbox
+    raw = _screen_grabber.grab({"left": left, "top": top, "width": right - left, "height": bottom - top})
+    # Decode the BGRA buffer straight into RGB, skipping mss's intermediate .rgb copy.
+    return Image.frombuffer("RGB", raw.size, raw.bgra, "raw", "BGRX", 0, 1)